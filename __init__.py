@@ -21,6 +21,8 @@ __all__ = ["NODE_CLASS_MAPPINGS", "NODE_DISPLAY_NAME_MAPPINGS"]
     MONITOR_INTERVAL：线程监控间隔 (秒)，默认 300
     CPU_THRESHOLD: 低于多少利用率执行 80%
     STATE_FILE: 清理-扫描记录文件 默认 /tmp/cleanup_daemon_state.json
+    FULL_RESCAN_EVERY: 每隔多少次清理做一次全量扫描，默认 12（其余只扫描有变化的目录）
+    DELETE_WORKERS: 并行删除文件的线程数，默认 8
 启动 ComfyUI 时会自动加载并启动清理程序，无需额外操作
 
 """
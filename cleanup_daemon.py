@@ -5,18 +5,29 @@
 """
 
 import os
+import re
 import sys
 import time
 import logging
+import logging.handlers
+import queue
 import signal
+import bisect
+from operator import attrgetter
+from functools import lru_cache
 import psutil
-from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 import json
 from datetime import datetime, timedelta
 import threading
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+try:
+    import orjson  # 可选依赖，序列化状态文件更快
+except ImportError:
+    orjson = None
 
 # 环境变量默认配置
 DEFAULT_CONFIG = {
@@ -28,11 +39,18 @@ DEFAULT_CONFIG = {
     "HEARTBEAT_INTERVAL": "300",  # 心跳检测间隔（秒，默认5分钟）
     "CPU_THRESHOLD": "80.0",
     "STATE_FILE": "/tmp/cleanup_daemon_state.json",
-    "HEARTBEAT_TIMEOUT": "600"  # 心跳超时时间（秒，默认10分钟）
+    "HEARTBEAT_TIMEOUT": "600",  # 心跳超时时间（秒，默认10分钟）
+    "FULL_RESCAN_EVERY": "12",  # 每隔多少次清理做一次全量扫描（其余为增量扫描）
+    "DELETE_WORKERS": "8"  # 并行删除文件的线程数
 }
 
+# 保留时间格式：数字（可带小数）+ 可选单位，如 "7d"、"1.5h"、"30days"；单位按首字母 s/m/h/d 计算
+RETENTION_TIME_PATTERN = re.compile(
+    r'^(\d+(?:\.\d*)?|\.\d+)\s*(s|secs?|seconds?|m|mins?|minutes?|h|hrs?|hours?|d|days?)?$'
+)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FileInfo:
     """文件信息类"""
     path: str
@@ -41,7 +59,15 @@ class FileInfo:
     relative_path: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class DirInfo:
+    """目录信息类（增量扫描缓存）"""
+    mtime: float
+    subdirs: List[str]
+    files: List[str]
+
+
+@dataclass(slots=True, frozen=True)
 class CleanupConfig:
     """清理配置类"""
     directories: List[str]
@@ -53,33 +79,70 @@ class CleanupConfig:
     cpu_threshold: float
     state_file: str
     heartbeat_timeout: int
+    full_rescan_every: int
+    delete_workers: int
 
 
 class LogCleanupDaemon:
     def __init__(self):
         self._setup_logging()
         self.config = self._load_config()
-        self.file_registry: Dict[str, List[FileInfo]] = {}
+        self.file_registry: Dict[str, Dict[str, FileInfo]] = {}
+        self.sorted_files: Dict[str, List[FileInfo]] = {}  # 与注册表内容相同，按修改时间升序（旧→新）维护
+        self.dir_cache: Dict[str, Dict[str, DirInfo]] = {}  # 各监控目录下子目录的缓存，用于增量扫描
+        self.scan_ticks = 0
+        self.state_dirty = False  # 注册表自上次保存后是否有变化
+        self.last_save_time = 0.0
         self.running = True
+        self.stop_event = threading.Event()  # 停止信号，用于唤醒等待中的线程
         self.state_lock = threading.Lock()
+        self.save_lock = threading.Lock()
         self.heartbeat_lock = threading.Lock()
         self.last_heartbeat = time.time()  # 心跳时间戳
         self.cleanup_thread: Optional[Thread] = None
         self.heartbeat_thread: Optional[Thread] = None
+        # 删除文件的线程池，start() 时创建、stop() 时关闭；网络文件系统上可并行掩盖 unlink 的延迟
+        self.delete_executor: Optional[ThreadPoolExecutor] = None
         self._load_initial_state()
 
     def _setup_logging(self):
-        """设置日志"""
+        """设置日志（日志文件由后台线程写入，不阻塞清理线程）"""
+        # QueueHandler 入队前已按 basicConfig 的格式格式化，文件处理器直接写出消息
+        file_handler = logging.handlers.RotatingFileHandler(
+            '/var/log/cleanup-daemon.log', maxBytes=10 * 1024 * 1024, backupCount=3
+        )
+        log_queue = queue.Queue()
+        self.log_queue_handler = logging.handlers.QueueHandler(log_queue)
+        self.log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+        self.log_listener_running = False
+
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             handlers=[
                 logging.StreamHandler(sys.stdout),
-                logging.FileHandler('/var/log/cleanup-daemon.log')
+                self.log_queue_handler
             ]
         )
+        # 根日志器已有处理器时 basicConfig 不生效，此时不写日志文件
+        self.log_to_file = self.log_queue_handler in logging.getLogger().handlers
+        self._start_log_listener()
         self.logger = logging.getLogger("ComfyUILogCleaner")
 
+    def _start_log_listener(self):
+        """启动日志文件写入线程，并挂上 QueueHandler"""
+        if self.log_to_file and not self.log_listener_running:
+            logging.getLogger().addHandler(self.log_queue_handler)
+            self.log_listener.start()
+            self.log_listener_running = True
+
+    def _stop_log_listener(self):
+        """移除 QueueHandler 并停止日志文件写入线程，避免之后的日志写入无人消费的队列"""
+        if self.log_listener_running:
+            logging.getLogger().removeHandler(self.log_queue_handler)
+            self.log_listener.stop()
+            self.log_listener_running = False
+
     def _parse_retention_time(self, time_str: str) -> int:
         """解析保留时间字符串为秒"""
         units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
@@ -90,25 +153,19 @@ class LogCleanupDaemon:
             return 3 * 86400
 
         try:
-            num_str = []
-            unit = 'd'
-            for c in time_str:
-                if c.isdigit() or c == '.':
-                    num_str.append(c)
-                else:
-                    if c in units:
-                        unit = c
-                    break
+            match = RETENTION_TIME_PATTERN.match(time_str)
+            if not match:
+                raise ValueError(f"格式无效: {time_str}")
 
-            if not num_str:
-                raise ValueError("未找到有效数字")
-
-            return int(float(''.join(num_str)) * units[unit])
+            num_str, unit = match.groups()
+            return int(float(num_str) * units[unit[0] if unit else 'd'])
         except Exception as e:
             self.logger.warning(f"解析保留时间失败: {e}，使用默认3天")
             return 3 * 86400
 
-    def _format_seconds(self, seconds: int) -> str:
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _format_seconds(seconds: int) -> str:
         """将秒数转换为易读格式"""
         if seconds >= 86400:
             return f"{seconds // 86400}天"
@@ -127,7 +184,8 @@ class LogCleanupDaemon:
             return os.getenv(key, DEFAULT_CONFIG[key])
 
         return CleanupConfig(
-            directories=get_env("CLEANUP_DIRECTORIES").split(','),
+            # 目录字符串作为注册表的键，驻留后字典查找可直接比较引用
+            directories=[sys.intern(d) for d in get_env("CLEANUP_DIRECTORIES").split(',')],
             retention_seconds=self._parse_retention_time(get_env("RETENTION_DAYS")),
             max_files_per_dir=int(get_env("MAX_FILES_PER_DIR")),
             max_disk_size_bytes=int(get_env("MAX_DISK_SIZE_MB")) * 1024 * 1024,
@@ -135,26 +193,37 @@ class LogCleanupDaemon:
             heartbeat_interval=int(get_env("HEARTBEAT_INTERVAL")),
             cpu_threshold=float(get_env("CPU_THRESHOLD")),
             state_file=get_env("STATE_FILE"),
-            heartbeat_timeout=int(get_env("HEARTBEAT_TIMEOUT"))
+            heartbeat_timeout=int(get_env("HEARTBEAT_TIMEOUT")),
+            full_rescan_every=max(1, int(get_env("FULL_RESCAN_EVERY"))),
+            delete_workers=max(1, int(get_env("DELETE_WORKERS")))
         )
 
     def _load_initial_state(self):
         """加载初始文件状态"""
         if os.path.exists(self.config.state_file):
             try:
-                with open(self.config.state_file, 'r') as f:
-                    state_data = json.load(f)
+                with open(self.config.state_file, 'rb') as f:
+                    raw_data = f.read()
+                state_data = None
+                if orjson is not None:
+                    try:
+                        state_data = orjson.loads(raw_data)
+                    except orjson.JSONDecodeError:
+                        # 标准库写出的代理字符转义 orjson 无法解析，改用标准库
+                        pass
+                if state_data is None:
+                    state_data = json.loads(raw_data)
 
                 with self.state_lock:
                     for dir_path, files_data in state_data.items():
-                        self.file_registry[dir_path] = [
-                            FileInfo(
+                        self.file_registry[dir_path] = {
+                            fd['path']: FileInfo(
                                 path=fd['path'],
                                 size=fd['size'],
                                 mtime=fd['mtime'],
                                 relative_path=fd['relative_path']
                             ) for fd in files_data
-                        ]
+                        }
                 self.logger.info(f"已从 {self.config.state_file} 加载状态数据")
             except Exception as e:
                 self.logger.warning(f"加载状态文件失败: {e}")
@@ -164,156 +233,215 @@ class LogCleanupDaemon:
             self._scan_directory(directory)
         self._save_state()
 
-    def _scan_directory(self, directory: str):
-        """扫描目录并更新文件注册表"""
-        dir_path = Path(directory)
-        if not dir_path.exists():
+    def _scandir_recursive(self, root: str, old_dirs: Dict[str, DirInfo],
+                           new_dirs: Dict[str, DirInfo], full_rescan: bool):
+        """递归遍历目录，产出文件的 DirEntry，复用 DirEntry 缓存的类型信息
+
+        增量扫描时修改时间未变的目录跳过 scandir，只沿缓存的子目录继续向下检查
+        """
+        mtime = os.stat(root).st_mtime
+        cached = old_dirs.get(root)
+        if not full_rescan and cached is not None and cached.mtime == mtime:
+            dir_info = cached
+        else:
+            dir_info = DirInfo(mtime=mtime, subdirs=[], files=[])
+            with os.scandir(root) as it:
+                for entry in it:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        dir_info.subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        dir_info.files.append(entry.path)
+                        yield entry
+        # scandir 完整结束后才缓存，失败的目录下次扫描时会重新 scandir
+        new_dirs[root] = dir_info
+
+        for sub_path in dir_info.subdirs:
+            try:
+                yield from self._scandir_recursive(sub_path, old_dirs, new_dirs, full_rescan)
+            except OSError as e:
+                self.logger.debug(f"无法访问目录 {sub_path}: {e}")
+
+    def _scan_directory(self, directory: str, full_rescan: bool = True):
+        """扫描目录并更新文件注册表
+
+        全量扫描遍历所有目录；增量扫描只对修改时间变化的目录执行 scandir，
+        未变化目录中的已知文件直接按路径 stat。所有文件每次都会重新 stat，
+        以发现追加写入等原地修改，属性未变的沿用原对象
+        """
+        if not os.path.isdir(directory):
             self.logger.warning(f"目录不存在: {directory}")
             return
 
-        current_files = {}
+        with self.state_lock:
+            cached_files = self.file_registry.get(directory, {})
+
+        # 相对路径直接从 entry.path 截取前缀得到，无需构造 Path 对象
+        base_len = len(os.path.join(directory, ''))
+        old_dirs = self.dir_cache.get(directory, {})
+        new_dirs: Dict[str, DirInfo] = {}
+        current_files: Dict[str, FileInfo] = {}
+        added: List[FileInfo] = []
+
+        def record(path: str, stat: os.stat_result):
+            cached = cached_files.get(path)
+            if cached is not None and cached.size == stat.st_size and cached.mtime == stat.st_mtime:
+                current_files[path] = cached  # 大小和修改时间未变的文件沿用原对象
+                return
+
+            file_info = FileInfo(
+                path=path,
+                size=stat.st_size,
+                mtime=stat.st_mtime,
+                relative_path=path[base_len:]
+            )
+            added.append(file_info)
+            current_files[path] = file_info
+
         try:
-            for file_path in dir_path.rglob('*'):
-                if file_path.is_file():
-                    try:
-                        stat = file_path.stat()
-                        relative_path = str(file_path.relative_to(dir_path))
-                        current_files[str(file_path)] = FileInfo(
-                            path=str(file_path),
-                            size=stat.st_size,
-                            mtime=stat.st_mtime,
-                            relative_path=relative_path
-                        )
-                    except (OSError, ValueError) as e:
-                        self.logger.debug(f"无法访问文件 {file_path}: {e}")
+            for entry in self._scandir_recursive(directory, old_dirs, new_dirs, full_rescan):
+                try:
+                    record(entry.path, entry.stat(follow_symlinks=False))
+                except OSError as e:
+                    self.logger.debug(f"无法访问文件 {entry.path}: {e}")
+
+            # 未变化的目录跳过了 scandir，其中的已知文件按路径重新 stat
+            for dir_path, dir_info in new_dirs.items():
+                if dir_info is old_dirs.get(dir_path):
+                    for path in dir_info.files:
+                        try:
+                            record(path, os.stat(path, follow_symlinks=False))
+                        except OSError as e:
+                            self.logger.debug(f"无法访问文件 {path}: {e}")
         except Exception as e:
             self.logger.error(f"扫描目录 {directory} 失败: {e}")
             return
 
+        # 除新增对象外其余均沿用自 cached_files，因此无新增且数量相同即表示没有变化
+        changed = bool(added) or len(current_files) != len(cached_files)
+        sorted_files = self.sorted_files.get(directory)
+        if sorted_files is None:
+            sorted_files = sorted(current_files.values(), key=attrgetter('mtime'))
+        elif changed:
+            # 去掉已消失或被替换的文件，再按修改时间插入新文件，保持有序
+            sorted_files = [f for f in sorted_files if current_files.get(f.path) is f]
+            if len(added) * 8 > len(sorted_files):
+                # 新增较多（如全量扫描后大量文件变化）时整体排序更快
+                sorted_files.extend(added)
+                sorted_files.sort(key=attrgetter('mtime'))
+            else:
+                for f in added:
+                    bisect.insort(sorted_files, f, key=attrgetter('mtime'))
+
+        self.dir_cache[directory] = new_dirs
         with self.state_lock:
-            self.file_registry[directory] = list(current_files.values())
+            if changed:
+                self.state_dirty = True
+            self.file_registry[directory] = current_files
+            self.sorted_files[directory] = sorted_files
+
+    def _is_cpu_busy(self, interval: Optional[float] = None) -> bool:
+        """检查CPU是否忙碌
 
-    def _is_cpu_busy(self) -> bool:
-        """检查CPU是否忙碌"""
+        interval 为 None 时非阻塞采样，返回本线程上次调用以来的平均使用率
+        """
         try:
-            return psutil.cpu_percent(interval=1) > self.config.cpu_threshold
+            return psutil.cpu_percent(interval=interval) > self.config.cpu_threshold
         except Exception as e:
             self.logger.warning(f"获取CPU使用率失败: {e}")
             return False
 
-    def _cleanup_by_time(self, directory: str) -> int:
-        """按时间清理文件"""
-        cutoff_time = time.time() - self.config.retention_seconds
-        retention_str = self._format_seconds(self.config.retention_seconds)
-        files_removed = 0
-
-        with self.state_lock:
-            files = self.file_registry.get(directory, [])
-            to_remove = [f for f in files if f.mtime < cutoff_time]
-            to_keep = [f for f in files if f not in to_remove]
-
-            if to_remove:
-                self.logger.info(f"目录 {directory} 有 {len(to_remove)} 个文件超过保留时间（{retention_str}）")
-                for f in to_remove:
-                    try:
-                        Path(f.path).unlink()
-                        files_removed += 1
-                        self.logger.info(f"按时间清理: {f.path}")
-                    except Exception as e:
-                        self.logger.warning(f"删除失败 {f.path}: {e}")
-
-            self.file_registry[directory] = to_keep
-
-        return files_removed
-
-    def _cleanup_by_count(self, directory: str) -> int:
-        """按文件数量清理"""
-        with self.state_lock:
-            files = self.file_registry.get(directory, [])
-            current_count = len(files)
-            max_count = self.config.max_files_per_dir
-
-            if current_count <= max_count:
-                return 0
-
-            need_remove = current_count - max_count
-            files.sort(key=lambda x: x.mtime)  # 按修改时间排序（旧→新）
-            to_remove = files[:need_remove]
-            to_keep = files[need_remove:]
-
-            self.logger.info(
-                f"目录 {directory} 文件数超限（当前{current_count}，上限{max_count}），"
-                f"清理最旧的{need_remove}个文件"
-            )
-
-            files_removed = 0
-            for f in to_remove:
-                try:
-                    Path(f.path).unlink()
-                    files_removed += 1
-                    self.logger.info(f"按数量清理: {f.path}")
-                except Exception as e:
-                    self.logger.warning(f"删除失败 {f.path}: {e}")
+    @staticmethod
+    def _unlink(path: str) -> Optional[OSError]:
+        """删除文件，失败时返回异常而不抛出，便于在线程池中批量执行"""
+        try:
+            os.unlink(path)
+        except OSError as e:
+            return e
+        return None
 
-            self.file_registry[directory] = to_keep
+    def _cleanup_directory(self, directory: str) -> Tuple[int, int, int, int]:
+        """按时间、文件数量、磁盘大小清理目录（文件列表已有序，只需截取最旧的前缀）
 
-        return files_removed
+        返回 (按时间, 按数量, 按大小) 删除的文件数，以及释放的字节数
+        """
+        cutoff_time = time.time() - self.config.retention_seconds
+        max_size = self.config.max_disk_size_bytes
+        reason_labels = ("时间", "数量", "大小")
+        removed_counts = [0, 0, 0]
 
-    def _cleanup_by_size(self, directory: str) -> int:
-        """按磁盘大小清理"""
         with self.state_lock:
-            files = self.file_registry.get(directory, [])
-            total_size = sum(f.size for f in files)
-            max_size = self.config.max_disk_size_bytes
-
-            if total_size <= max_size:
-                return 0
-
-            # 按修改时间排序（旧→新）
-            files.sort(key=lambda x: x.mtime)
-            current_size = total_size
-            to_remove = []
-
-            for f in files:
-                if current_size <= max_size:
-                    break
-                to_remove.append(f)
-                current_size -= f.size
-
-            self.logger.info(
-                f"目录 {directory} 大小超限（当前{total_size / 1024 / 1024:.2f}MB，"
-                f"上限{max_size / 1024 / 1024:.2f}MB），清理最旧的{len(to_remove)}个文件"
-            )
-
-            files_removed = 0
-            for f in to_remove:
-                try:
-                    Path(f.path).unlink()
-                    files_removed += 1
-                    self.logger.info(f"按大小清理: {f.path}")
-                except Exception as e:
-                    self.logger.warning(f"删除失败 {f.path}: {e}")
-
-            self.file_registry[directory] = files[len(to_remove):]
+            # 文件列表按修改时间有序（旧→新），三种规则需要删除的都是最旧的一段前缀
+            files = self.sorted_files.get(directory, [])
+            time_cut = bisect.bisect_left(files, cutoff_time, key=attrgetter('mtime'))
+            count_cut = len(files) - self.config.max_files_per_dir
+            cut = max(time_cut, count_cut, 0)
+            current_size = sum(map(attrgetter('size'), files[cut:]))
+            while cut < len(files) and current_size > max_size:
+                current_size -= files[cut].size
+                cut += 1
+
+            to_remove: List[Tuple[FileInfo, int]] = [
+                (f, 0 if i < time_cut else 1 if i < count_cut else 2)
+                for i, f in enumerate(files[:cut])
+            ]
 
-        return files_removed
+            # 先提交删除任务再修改注册表；线程池未启动或已关闭时，未提交的文件保留在注册表中
+            executor = self.delete_executor
+            futures = []
+            if executor is not None:
+                for f, _ in to_remove:
+                    try:
+                        futures.append(executor.submit(self._unlink, f.path))
+                    except RuntimeError:
+                        break
+            if len(futures) < len(to_remove):
+                self.logger.warning(f"删除线程池不可用，目录 {directory} 有 {len(to_remove) - len(futures)} 个文件未删除")
+                to_remove = to_remove[:len(futures)]
 
-    def _perform_cleanup(self):
+            if to_remove:
+                registry = self.file_registry[directory]
+                for f, _ in to_remove:
+                    del registry[f.path]
+                del files[:len(to_remove)]
+                self.state_dirty = True
+
+        # 等待删除结果在锁外进行，避免慢速磁盘上的 unlink 阻塞其他线程读取注册表
+        freed_size = 0
+        for (f, reason), future in zip(to_remove, futures):
+            try:
+                error = future.result()
+            except CancelledError:
+                # 守护程序停止时取消的删除任务，文件仍在，下次扫描会重新登记
+                self.logger.debug(f"删除已取消: {f.path}")
+                continue
+            if error is None:
+                removed_counts[reason] += 1
+                freed_size += f.size
+                self.logger.debug(f"按{reason_labels[reason]}清理: {f.path}")
+            else:
+                self.logger.warning(f"删除失败 {f.path}: {error}")
+
+        return removed_counts[0], removed_counts[1], removed_counts[2], freed_size
+
+    def _perform_cleanup(self, cpu_interval: Optional[float] = None):
         """执行清理操作"""
-        if self._is_cpu_busy():
+        if self._is_cpu_busy(cpu_interval):
             self.logger.info("CPU使用率超限，跳过本次清理")
             return
 
-        self.logger.info("开始清理扫描...")
+        self.scan_ticks += 1
+        full_rescan = self.scan_ticks % self.config.full_rescan_every == 0
+        self.logger.info(f"开始清理扫描（{'全量' if full_rescan else '增量'}）...")
         for directory in self.config.directories:
-            self._scan_directory(directory)
-            time_removed = self._cleanup_by_time(directory)
-            count_removed = self._cleanup_by_count(directory)
-            size_removed = self._cleanup_by_size(directory)
+            self._scan_directory(directory, full_rescan)
+            time_removed, count_removed, size_removed, freed_size = self._cleanup_directory(directory)
 
             self.logger.info(
                 f"目录 {directory} 清理完成: "
-                f"时间[{time_removed}] 数量[{count_removed}] 大小[{size_removed}]"
+                f"时间[{time_removed}] 数量[{count_removed}] 大小[{size_removed}]，"
+                f"释放{freed_size / 1024 / 1024:.2f}MB"
             )
 
         self._save_state()
@@ -321,30 +449,54 @@ class LogCleanupDaemon:
         with self.heartbeat_lock:
             self.last_heartbeat = time.time()
 
-    def _save_state(self):
-        """保存状态到文件"""
-        try:
-            state_dir = os.path.dirname(self.config.state_file)
-            if not os.path.exists(state_dir):
-                os.makedirs(state_dir, exist_ok=True)
-
-            with self.state_lock:
-                state_data = {
-                    dir_path: [
-                        {
-                            'path': f.path,
-                            'size': f.size,
-                            'mtime': f.mtime,
-                            'relative_path': f.relative_path
-                        } for f in files
-                    ]
-                    for dir_path, files in self.file_registry.items()
-                }
-
-            with open(self.config.state_file, 'w') as f:
-                json.dump(state_data, f, indent=2)
-        except Exception as e:
-            self.logger.error(f"保存状态文件失败: {e}")
+    def _save_state(self, throttle: bool = True):
+        """保存状态到文件（注册表无变化时跳过；throttle 为 True 时限制保存频率）"""
+        if throttle and time.time() - self.last_save_time < max(self.config.scan_interval, 60):
+            return
+
+        # 清理线程与 stop() 可能同时保存，串行化写入避免争用同一个临时文件
+        with self.save_lock:
+            try:
+                state_dir = os.path.dirname(self.config.state_file)
+                if state_dir and not os.path.exists(state_dir):
+                    os.makedirs(state_dir, exist_ok=True)
+
+                with self.state_lock:
+                    if not self.state_dirty:
+                        return
+                    self.state_dirty = False
+                    state_data = {
+                        dir_path: [
+                            {
+                                'path': f.path,
+                                'size': f.size,
+                                'mtime': f.mtime,
+                                'relative_path': f.relative_path
+                            } for f in files.values()
+                        ]
+                        for dir_path, files in self.file_registry.items()
+                    }
+
+                # 先写临时文件再原子替换，避免中途退出留下损坏的状态文件
+                tmp_file = self.config.state_file + '.tmp'
+                state_bytes = None
+                if orjson is not None:
+                    try:
+                        state_bytes = orjson.dumps(state_data)
+                    except orjson.JSONEncodeError:
+                        # 非 UTF-8 文件名在 Linux 上会带代理字符，orjson 无法序列化，改用标准库
+                        pass
+                if state_bytes is not None:
+                    with open(tmp_file, 'wb') as f:
+                        f.write(state_bytes)
+                else:
+                    with open(tmp_file, 'w') as f:
+                        json.dump(state_data, f, separators=(',', ':'))
+                os.replace(tmp_file, self.config.state_file)
+                self.last_save_time = time.time()
+            except Exception as e:
+                self.state_dirty = True
+                self.logger.error(f"保存状态文件失败: {e}")
 
     def _heartbeat_monitor(self):
         """心跳检测线程逻辑"""
@@ -366,10 +518,10 @@ class LogCleanupDaemon:
                 else:
                     self.logger.debug(f"心跳正常（上次活动: {datetime.fromtimestamp(self.last_heartbeat)}）")
 
-                time.sleep(self.config.heartbeat_interval)
+                self.stop_event.wait(self.config.heartbeat_interval)
             except Exception as e:
                 self.logger.error(f"心跳检测出错: {e}")
-                time.sleep(60)
+                self.stop_event.wait(60)
 
     def _start_cleanup_thread(self):
         """启动清理线程"""
@@ -383,27 +535,37 @@ class LogCleanupDaemon:
             self.logger.info("正在停止清理线程...")
             # 触发线程退出
             self.running = False
-            self.cleanup_thread.join(timeout=10)
+            self.stop_event.set()
+            self.cleanup_thread.join(timeout=2)
             if self.cleanup_thread.is_alive():
                 self.logger.warning("清理线程强制终止")
 
     def _cleanup_loop(self):
         """清理线程主循环"""
+        # psutil 按调用线程分别记录非阻塞采样的基线，本线程首次检查没有基线，
+        # 阻塞采样 1 秒得到真实使用率，同时建立后续非阻塞采样的基线
+        cpu_interval: Optional[float] = 1
         while self.running:
             try:
-                self._perform_cleanup()
-                # 等待下次扫描
-                for _ in range(self.config.scan_interval):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                self._perform_cleanup(cpu_interval)
+                cpu_interval = None
+                # 等待下次扫描，收到停止信号时立即返回
+                if self.stop_event.wait(self.config.scan_interval):
+                    return
             except Exception as e:
                 self.logger.error(f"清理循环出错: {e}")
-                time.sleep(60)
+                self.stop_event.wait(60)
 
     def start(self):
         """启动守护程序（清理线程+心跳线程）"""
         self.running = True
+        self.stop_event.clear()
+        self._start_log_listener()
+        if self.delete_executor is None:
+            self.delete_executor = ThreadPoolExecutor(
+                max_workers=self.config.delete_workers,
+                thread_name_prefix="ComfyUILogCleaner-unlink"
+            )
         self._start_cleanup_thread()
         self.heartbeat_thread = Thread(target=self._heartbeat_monitor, daemon=True)
         self.heartbeat_thread.start()
@@ -413,19 +575,33 @@ class LogCleanupDaemon:
         """停止守护程序"""
         self.logger.info("正在停止守护程序...")
         self.running = False
+        self.stop_event.set()
         if self.cleanup_thread:
-            self.cleanup_thread.join(timeout=10)
+            self.cleanup_thread.join(timeout=2)
         if self.heartbeat_thread:
-            self.heartbeat_thread.join(timeout=10)
-        self._save_state()
+            self.heartbeat_thread.join(timeout=2)
+        # 线程池的工作线程不是守护线程，不关闭的话卡住的 unlink 会阻塞进程退出
+        if self.delete_executor is not None:
+            self.delete_executor.shutdown(wait=False, cancel_futures=True)
+            self.delete_executor = None
+        self._save_state(throttle=False)
         self.logger.info("守护程序已停止")
+        self._stop_log_listener()
+
+
+# 进程内唯一的守护程序实例，避免 ComfyUI 重新加载插件时重复启动
+_daemon_instance: Optional[LogCleanupDaemon] = None
+_daemon_lock = threading.Lock()
 
 
 def start_cleanup_daemon():
-    """启动清理守护程序（供外部调用）"""
-    daemon = LogCleanupDaemon()
-    daemon.start()
-    return daemon
+    """启动清理守护程序（供外部调用），已启动时返回现有实例"""
+    global _daemon_instance
+    with _daemon_lock:
+        if _daemon_instance is None:
+            _daemon_instance = LogCleanupDaemon()
+            _daemon_instance.start()
+        return _daemon_instance
 
 
 def main():